@@ -17,6 +17,10 @@ class AuthenticationManager:
     def get_current_user_profile(self):
         """Retrieve the current user's profile data."""
         if 'username' in st.session_state:
+            # Profile is stashed in the session at login; fall back to the DB
+            # for sessions that predate it.
+            if 'profile' in st.session_state:
+                return st.session_state.profile
             username = st.session_state.username
             return self.db.get_user_profile(username)
         return None
@@ -25,7 +29,11 @@ class AuthenticationManager:
         """Update the current user's profile with the provided updates."""
         if 'username' in st.session_state:
             username = st.session_state.username
-            return self.db.update_user_profile(username, updates)
+            success, message = self.db.update_user_profile(username, updates)
+            if success:
+                # Drop the stashed profile so the next read refetches it
+                st.session_state.pop('profile', None)
+            return success, message
         return False, "User not authenticated"
 
     def change_password(self, current_password, new_password):
@@ -42,6 +50,37 @@ class AuthenticationManager:
             return self.db.delete_user(username, password)
         return False, "User not authenticated"
 
+@st.cache_resource(show_spinner=False)
+def get_auth_manager():
+    """Return the process-wide AuthenticationManager.
+
+    Streamlit reruns the script on every widget interaction; caching the
+    manager avoids reconstructing it (and anything it holds) each time.
+    """
+    return AuthenticationManager()
+
+@st.fragment
+def _login_form():
+    """Login form isolated in a fragment so typing only reruns the form."""
+    with st.form("login_form", clear_on_submit=True):
+        username = st.text_input("Username", placeholder="Enter your username", label_visibility="collapsed")
+        password = st.text_input("Password", type="password", placeholder="Enter your password", label_visibility="collapsed")
+        remember = st.checkbox("Remember me", label_visibility="collapsed")
+
+        submitted = st.form_submit_button("Sign In")
+        if submitted:
+            with st.spinner("Authenticating..."):
+                # Verify and fetch the profile in one DB round-trip
+                profile = DatabaseOperations.verify_and_fetch(username, password)
+                if profile is not None:
+                    st.success("Login successful!")
+                    st.session_state.authenticated = True
+                    st.session_state.username = username
+                    st.session_state.profile = profile
+                    st.rerun(scope="app")
+                else:
+                    st.error("Invalid username or password")
+
 def login_page():
 
     # Create two columns for form and image
@@ -50,23 +89,7 @@ def login_page():
 
     with col1:
         # Form Box on Left
-        with st.form("login_form", clear_on_submit=True):
-            username = st.text_input("Username", placeholder="Enter your username", label_visibility="collapsed")
-            password = st.text_input("Password", type="password", placeholder="Enter your password", label_visibility="collapsed")
-            remember = st.checkbox("Remember me", label_visibility="collapsed")
-
-            submitted = st.form_submit_button("Sign In")
-            if submitted:
-                with st.spinner("Authenticating..."):
-                    # Simulate lightweight server-side check instead of delay
-                    is_authenticated = DatabaseOperations.verify_user(username, password)
-                    if is_authenticated:
-                        st.success("Login successful!")
-                        st.session_state.authenticated = True
-                        st.session_state.username = username
-                        st.rerun()
-                    else:
-                        st.error("Invalid username or password")
+        _login_form()
 
         st.markdown("<div class='auth-divider'><span>OR</span></div>", unsafe_allow_html=True)
 
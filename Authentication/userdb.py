@@ -1,169 +1,329 @@
 # File: Authentication/userdb.py
 import sqlite3
 import bcrypt
+import hashlib
+import concurrent.futures
+import itertools
+import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+import streamlit as st
+
+# Serialize writers on the shared connection (SQLite allows one writer at a time).
+_DB_LOCK = threading.Lock()
+
+# bcrypt work factor. Login latency doubles with every +1; 10 is the commonly
+# recommended minimum, so operators can raise BCRYPT_ROUNDS on faster hardware
+# but never tune below it.
+_BCRYPT_ROUNDS = max(10, int(os.environ.get("BCRYPT_ROUNDS", "10")))
+
+# Compiled once so signups skip the per-call pattern-cache lookup.
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# The editable profile columns, in canonical order.
+_PROFILE_FIELDS = ('full_name', 'bio', 'profile_picture')
+
+# Every non-empty subset of the profile fields mapped to its prebuilt UPDATE
+# statement. Avoids per-call string assembly and keeps the SQL text stable so
+# SQLite's prepared-statement cache can reuse it on the long-lived connection.
+_UPDATE_SQL = {
+    frozenset(subset): (
+        "UPDATE users SET " + ", ".join(f"{col}=?" for col in subset) + " WHERE username=?",
+        subset,
+    )
+    for r in range(1, len(_PROFILE_FIELDS) + 1)
+    for subset in itertools.combinations(_PROFILE_FIELDS, r)
+}
+
+# bcrypt releases the GIL while hashing in C, so running it on a bounded pool
+# lets concurrent signups/logins use all cores instead of serializing in the
+# Streamlit script thread.
+_BCRYPT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def _hashpw(password, salt):
+    """Run bcrypt.hashpw on the worker pool."""
+    return _BCRYPT_POOL.submit(bcrypt.hashpw, password, salt).result()
+
+
+def _checkpw(password, hashed):
+    """Run bcrypt.checkpw on the worker pool."""
+    return _BCRYPT_POOL.submit(bcrypt.checkpw, password, hashed).result()
+
+
+# Small LRU of username -> stored bcrypt hash (as bytes), so repeated attempts
+# against the same account skip the SQL round-trip and the str->bytes re-encode
+# of the stored hash. Entries are dropped on password change or deletion.
+_HASH_CACHE = OrderedDict()
+_HASH_CACHE_MAX = 256
+
+
+def _get_stored_hash(username):
+    """Return the stored bcrypt hash bytes for a user, or None if unknown."""
+    cached = _HASH_CACHE.get(username)
+    if cached is not None:
+        _HASH_CACHE.move_to_end(username)
+        return cached
+
+    c = get_conn().cursor()
+    c.execute("SELECT password FROM users WHERE username=?", (username,))
+    result = c.fetchone()
+    if result is None:
+        return None
+
+    stored = result[0].encode('utf-8')
+    _HASH_CACHE[username] = stored
+    if len(_HASH_CACHE) > _HASH_CACHE_MAX:
+        _HASH_CACHE.popitem(last=False)
+    return stored
+
+
+def _evict_stored_hash(username):
+    """Drop a user's cached hash after a credential change."""
+    _HASH_CACHE.pop(username, None)
+
+
+# In-memory set of existing usernames, loaded by init_db. Verification for a
+# username that cannot exist returns immediately without touching SQLite or
+# bcrypt, which keeps credential-stuffing probes of random names cheap. An
+# exact set stands in for a Bloom filter here: the user table is small and
+# this avoids pulling in a probabilistic-filter dependency.
+_known_users = None
+
+
+def _execute_write(sql, params):
+    """Run a single write inside a BEGIN IMMEDIATE transaction.
+
+    Taking the write lock up front avoids the deferred-to-exclusive lock
+    upgrade (and the busy-retry storms it causes) when a reader and a writer
+    overlap on the shared connection.
+    """
+    conn = get_conn()
+    with _DB_LOCK:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+@st.cache_resource(show_spinner=False)
+def get_conn():
+    """Return the single long-lived connection to app.db for this process.
+
+    Opening a connection per call forces redundant file opens and throws away
+    SQLite's prepared-statement cache; WAL mode lets a reader (login) overlap
+    with a writer (signup).
+    """
+    conn = sqlite3.connect('app.db', check_same_thread=False, isolation_level=None)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-64000;"
+    )
+    return conn
+
+
+@st.cache_data(ttl=300, max_entries=1024, show_spinner=False)
+def _verify_cached(username, password_digest, _password):
+    """Memoized credential check so Streamlit reruns skip the bcrypt work.
+
+    The cache key is (username, sha256-of-password); the plaintext itself is
+    passed as `_password` so Streamlit excludes it from the key. Entries expire
+    after 5 minutes and are cleared explicitly on password change or account
+    deletion.
+    """
+    stored = _get_stored_hash(username)
+    if stored is not None:
+        return _checkpw(_password.encode('utf-8'), stored)
+    return False
+
 
 class DatabaseOperations:
     @staticmethod
     def init_db():
         """Initialize the database and create the users table if it doesn't exist."""
-        conn = sqlite3.connect('app.db')
+        conn = get_conn()
         c = conn.cursor()
 
-        # Check if the 'users' table exists
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-        table_exists = c.fetchone() is not None
-
-        if not table_exists:
-            # Create the table with all necessary columns
-            c.execute('''
-                CREATE TABLE users (
-                    username TEXT PRIMARY KEY, 
-                    password TEXT NOT NULL, 
-                    email TEXT NOT NULL, 
-                    role TEXT DEFAULT 'user',
-                    full_name TEXT DEFAULT '',
-                    bio TEXT DEFAULT '',
-                    profile_picture TEXT DEFAULT NULL,
-                    created_at TEXT NOT NULL
-                )
-            ''')
-        else:
-            # If table exists, add any missing columns
-            c.execute("PRAGMA table_info(users)")
-            columns = [column[1] for column in c.fetchall()]
-
-            if 'full_name' not in columns:
-                c.execute("ALTER TABLE users ADD COLUMN full_name TEXT DEFAULT ''")
-            if 'bio' not in columns:
-                c.execute("ALTER TABLE users ADD COLUMN bio TEXT DEFAULT ''")
-            if 'profile_picture' not in columns:
-                c.execute("ALTER TABLE users ADD COLUMN profile_picture TEXT DEFAULT NULL")
-            if 'created_at' not in columns:
-                c.execute("ALTER TABLE users ADD COLUMN created_at TEXT NOT NULL DEFAULT ''")
-
-        conn.commit()
-        conn.close()
+        with _DB_LOCK:
+            # journal_mode persists in the DB file, so setting it here at
+            # schema-creation time keeps the file in WAL mode even for tools
+            # that open app.db without going through get_conn().
+            c.execute("PRAGMA journal_mode=WAL")
+
+            # Check if the 'users' table exists
+            c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
+            table_exists = c.fetchone() is not None
+
+            if not table_exists:
+                # Create the table with all necessary columns
+                c.execute('''
+                    CREATE TABLE users (
+                        username TEXT PRIMARY KEY,
+                        password TEXT NOT NULL,
+                        email TEXT NOT NULL,
+                        role TEXT DEFAULT 'user',
+                        full_name TEXT DEFAULT '',
+                        bio TEXT DEFAULT '',
+                        profile_picture TEXT DEFAULT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                ''')
+            else:
+                # If table exists, add any missing columns
+                c.execute("PRAGMA table_info(users)")
+                columns = [column[1] for column in c.fetchall()]
+
+                if 'full_name' not in columns:
+                    c.execute("ALTER TABLE users ADD COLUMN full_name TEXT DEFAULT ''")
+                if 'bio' not in columns:
+                    c.execute("ALTER TABLE users ADD COLUMN bio TEXT DEFAULT ''")
+                if 'profile_picture' not in columns:
+                    c.execute("ALTER TABLE users ADD COLUMN profile_picture TEXT DEFAULT NULL")
+                if 'created_at' not in columns:
+                    c.execute("ALTER TABLE users ADD COLUMN created_at TEXT NOT NULL DEFAULT ''")
+
+            conn.commit()
+
+            # Load the known-username set for the fast negative-lookup path
+            global _known_users
+            c.execute("SELECT username FROM users")
+            _known_users = {row[0] for row in c.fetchall()}
 
     @staticmethod
     def add_user(username, password, email, role="user"):
         """Add a new user to the database."""
         if not username or not password or not email:
             return False, "All fields are required."
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+        if not _EMAIL_RE.match(email):
             return False, "Invalid email format."
         if len(password) < 8:
             return False, "Password must be at least 8 characters long."
 
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        conn = sqlite3.connect('app.db')
-        c = conn.cursor()
+        salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+        hashed = _hashpw(password.encode('utf-8'), salt)
         try:
             created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            c.execute("""
-                INSERT INTO users (username, password, email, role, full_name, bio, created_at) 
+            _execute_write("""
+                INSERT INTO users (username, password, email, role, full_name, bio, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (username, hashed.decode('utf-8'), email, role, '', '', created_at))
-            conn.commit()
+            if _known_users is not None:
+                _known_users.add(username)
             return True, "Account created successfully!"
         except sqlite3.IntegrityError:
             return False, "Username already exists."
-        finally:
-            conn.close()
 
     @staticmethod
     def verify_user(username, password):
         """Verify the user's credentials."""
-        conn = sqlite3.connect('app.db')
-        c = conn.cursor()
-        c.execute("SELECT password FROM users WHERE username=?", (username,))
+        if _known_users is not None and username not in _known_users:
+            return False
+        password_digest = hashlib.sha256(password.encode('utf-8')).hexdigest()
+        return _verify_cached(username, password_digest, password)
+
+    @staticmethod
+    def verify_and_fetch(username, password):
+        """Verify credentials and return the user's profile in a single query.
+
+        Merges verify_user + get_user_profile into one covering SELECT on the
+        primary key, so login costs one DB round-trip instead of two. Returns
+        the profile dict on success, or None on bad credentials.
+        """
+        if _known_users is not None and username not in _known_users:
+            return None
+        c = get_conn().cursor()
+        c.execute("""
+            SELECT username, password, email, role, full_name, bio, profile_picture, created_at
+            FROM users WHERE username=?
+        """, (username,))
         result = c.fetchone()
-        conn.close()
-        if result:
-            return bcrypt.checkpw(password.encode('utf-8'),
-                                  result[0].encode('utf-8'))
-        return False
+        if result is None:
+            return None
+        if not _checkpw(password.encode('utf-8'), result[1].encode('utf-8')):
+            return None
+        return {
+            'username': result[0],
+            'email': result[2],
+            'role': result[3],
+            'full_name': result[4] or '',
+            'bio': result[5] or '',
+            'profile_picture': result[6],
+            'created_at': result[7]
+        }
 
     @staticmethod
     def get_user_profile(username):
         """Retrieve the user's profile data."""
-        conn = sqlite3.connect('app.db')
-        c = conn.cursor()
-        try:
-            c.execute("""
-                SELECT username, email, role, full_name, bio, profile_picture, created_at 
-                FROM users WHERE username=?
-            """, (username,))
-            result = c.fetchone()
-
-            if result:
-                return {
-                    'username': result[0],
-                    'email': result[1],
-                    'role': result[2],
-                    'full_name': result[3] or '',
-                    'bio': result[4] or '',
-                    'profile_picture': result[5],
-                    'created_at': result[6]
-                }
-            return None
-        finally:
-            conn.close()
+        c = get_conn().cursor()
+        c.execute("""
+            SELECT username, email, role, full_name, bio, profile_picture, created_at
+            FROM users WHERE username=?
+        """, (username,))
+        result = c.fetchone()
+
+        if result:
+            return {
+                'username': result[0],
+                'email': result[1],
+                'role': result[2],
+                'full_name': result[3] or '',
+                'bio': result[4] or '',
+                'profile_picture': result[5],
+                'created_at': result[6]
+            }
+        return None
 
     @staticmethod
     def update_user_profile(username, updates):
         """Update the user's profile information."""
-        allowed_fields = {'full_name', 'bio', 'profile_picture'}
-        filtered_updates = {k: v for k, v in updates.items() if k in allowed_fields}
+        filtered_updates = {k: v for k, v in updates.items() if k in _PROFILE_FIELDS}
 
         if not filtered_updates:
             return False, "No valid fields to update"
 
-        conn = sqlite3.connect('app.db')
+        conn = get_conn()
         c = conn.cursor()
         try:
-            # Build the SQL query dynamically based on the filtered updates
-            query = "UPDATE users SET "
-            params = []
-            for key, value in filtered_updates.items():
-                query += f"{key}=?, "
-                params.append(value)
-            query = query.rstrip(", ") + " WHERE username=?"
-            params.append(username)
-
-            c.execute(query, tuple(params))
-            conn.commit()
+            # Look up the prebuilt statement for this combination of fields
+            query, columns = _UPDATE_SQL[frozenset(filtered_updates)]
+            params = [filtered_updates[col] for col in columns] + [username]
+
+            with _DB_LOCK:
+                c.execute(query, params)
+                conn.commit()
             return True, "Profile updated successfully!"
         except Exception as e:
             return False, f"Error updating profile: {str(e)}"
-        finally:
-            conn.close()
 
     @staticmethod
     def change_user_password(username, current_password, new_password):
         """Change the user's password."""
-        if not DatabaseOperations.verify_user(username, current_password):
-            return False, "Invalid current password."
-
+        # Cheap validation first, then all bcrypt work, so the write lock
+        # below is held only for the microseconds the UPDATE itself takes.
         if len(new_password) < 8:
             return False, "Password must be at least 8 characters long."
 
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(new_password.encode('utf-8'), salt)
-        conn = sqlite3.connect('app.db')
-        c = conn.cursor()
+        if not DatabaseOperations.verify_user(username, current_password):
+            return False, "Invalid current password."
+
+        salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+        hashed = _hashpw(new_password.encode('utf-8'), salt)
         try:
-            c.execute("UPDATE users SET password=? WHERE username=?",
-                      (hashed.decode('utf-8'), username))
-            conn.commit()
+            _execute_write("UPDATE users SET password=? WHERE username=?",
+                           (hashed.decode('utf-8'), username))
+            _evict_stored_hash(username)
+            _verify_cached.clear()
             return True, "Password changed successfully!"
         except Exception as e:
             return False, f"Error changing password: {str(e)}"
-        finally:
-            conn.close()
 
     @staticmethod
     def delete_user(username, password):
@@ -171,13 +331,16 @@ class DatabaseOperations:
         if not DatabaseOperations.verify_user(username, password):
             return False, "Invalid credentials."
 
-        conn = sqlite3.connect('app.db')
+        conn = get_conn()
         c = conn.cursor()
         try:
-            c.execute("DELETE FROM users WHERE username=?", (username,))
-            conn.commit()
+            with _DB_LOCK:
+                c.execute("DELETE FROM users WHERE username=?", (username,))
+                conn.commit()
+            if _known_users is not None:
+                _known_users.discard(username)
+            _evict_stored_hash(username)
+            _verify_cached.clear()
             return True, "Account deleted successfully!"
         except Exception as e:
             return False, f"Error deleting account: {str(e)}"
-        finally:
-            conn.close()
\ No newline at end of file
@@ -63,94 +63,112 @@ def create_summary_metrics():
         st.error(f"Error loading summary metrics: {e}")
 
 
-def create_all_charts(alerts_df):
-    """Create all charts in a grid layout."""
-    # Create two columns for charts
-    col1, col2 = st.columns(2)
+# Chart builders are pure functions of the alerts DataFrame, so they are
+# cached on its hash: Streamlit reruns the whole script on every widget
+# click, and without the cache all four figures (plus the pandas reductions
+# behind them) were rebuilt each time even though the data hadn't changed.
 
-    with col1:
-        # Daily Trends Chart
-        fig_trends = go.Figure()
-
-        for alert_type, color in zip(['high', 'medium', 'low'], ['#dc2626', '#f97316', '#eab308']):
-            fig_trends.add_trace(go.Scatter(
-                x=alerts_df['date'],
-                y=alerts_df[alert_type],
-                name=f'{alert_type.capitalize()} Alerts',
-                line=dict(color=color, width=2),
-                fill='tonexty'
-            ))
-
-        fig_trends.update_layout(
-            title='Alert Trends',
-            height=400,
-            showlegend=True,
-            plot_bgcolor='white',
-            paper_bgcolor='white'
-        )
+@st.cache_data(show_spinner=False)
+def _build_trends_chart(alerts_df):
+    fig_trends = go.Figure()
 
-        st.plotly_chart(fig_trends, use_container_width=True)
-
-        # Cumulative Trends
-        fig_cumulative = go.Figure()
-
-        for alert_type, color in zip(['high', 'medium', 'low'], ['#dc2626', '#f97316', '#eab308']):
-            fig_cumulative.add_trace(go.Scatter(
-                x=alerts_df['date'],
-                y=alerts_df[alert_type].cumsum(),
-                name=f'Cumulative {alert_type.capitalize()}',
-                line=dict(color=color, width=2),
-                stackgroup='one'
-            ))
-
-        fig_cumulative.update_layout(
-            title='Cumulative Alerts',
-            height=400,
-            showlegend=True,
-            plot_bgcolor='white',
-            paper_bgcolor='white'
-        )
-
-        st.plotly_chart(fig_cumulative, use_container_width=True)
+    for alert_type, color in zip(['high', 'medium', 'low'], ['#dc2626', '#f97316', '#eab308']):
+        fig_trends.add_trace(go.Scatter(
+            x=alerts_df['date'],
+            y=alerts_df[alert_type],
+            name=f'{alert_type.capitalize()} Alerts',
+            line=dict(color=color, width=2),
+            fill='tonexty'
+        ))
 
-    with col2:
-        # Distribution Pie Chart
-        total_alerts = alerts_df['high'].sum() + alerts_df['medium'].sum() + alerts_df['low'].sum()
-
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=['Critical', 'Medium', 'Low'],
-            values=[alerts_df['high'].sum(), alerts_df['medium'].sum(), alerts_df['low'].sum()],
-            hole=.4,
-            marker=dict(colors=['#dc2626', '#f97316', '#eab308'])
-        )])
-
-        fig_pie.update_layout(
-            title='Alert Distribution',
-            height=400,
-            annotations=[dict(text=f'Total\n{total_alerts}', x=0.5, y=0.5, font_size=20, showarrow=False)]
-        )
+    fig_trends.update_layout(
+        title='Alert Trends',
+        height=400,
+        showlegend=True,
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig_trends
 
-        st.plotly_chart(fig_pie, use_container_width=True)
 
-        # Alert Bar Chart
-        fig_bar = go.Figure()
+@st.cache_data(show_spinner=False)
+def _build_cumulative_chart(alerts_df):
+    fig_cumulative = go.Figure()
 
-        fig_bar.add_trace(go.Bar(
+    for alert_type, color in zip(['high', 'medium', 'low'], ['#dc2626', '#f97316', '#eab308']):
+        fig_cumulative.add_trace(go.Scatter(
             x=alerts_df['date'],
-            y=alerts_df['high'] + alerts_df['medium'] + alerts_df['low'],
-            name='Total Alerts',
-            marker_color='#3b82f6'
+            y=alerts_df[alert_type].cumsum(),
+            name=f'Cumulative {alert_type.capitalize()}',
+            line=dict(color=color, width=2),
+            stackgroup='one'
         ))
 
-        fig_bar.update_layout(
-            title='Daily Total Alerts',
-            height=400,
-            showlegend=True,
-            plot_bgcolor='white',
-            paper_bgcolor='white'
-        )
+    fig_cumulative.update_layout(
+        title='Cumulative Alerts',
+        height=400,
+        showlegend=True,
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig_cumulative
+
+
+@st.cache_data(show_spinner=False)
+def _build_pie_chart(alerts_df):
+    # One vectorized reduction over the three columns instead of four
+    # separate Series.sum() calls
+    sums = alerts_df[['high', 'medium', 'low']].sum()
+    total_alerts = int(sums.sum())
+
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=['Critical', 'Medium', 'Low'],
+        values=sums.tolist(),
+        hole=.4,
+        marker=dict(colors=['#dc2626', '#f97316', '#eab308'])
+    )])
+
+    fig_pie.update_layout(
+        title='Alert Distribution',
+        height=400,
+        annotations=[dict(text=f'Total\n{total_alerts}', x=0.5, y=0.5, font_size=20, showarrow=False)]
+    )
+    return fig_pie
+
+
+@st.cache_data(show_spinner=False)
+def _build_bar_chart(alerts_df):
+    fig_bar = go.Figure()
+
+    fig_bar.add_trace(go.Bar(
+        x=alerts_df['date'],
+        y=alerts_df['high'] + alerts_df['medium'] + alerts_df['low'],
+        name='Total Alerts',
+        marker_color='#3b82f6'
+    ))
+
+    fig_bar.update_layout(
+        title='Daily Total Alerts',
+        height=400,
+        showlegend=True,
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    return fig_bar
+
 
-        st.plotly_chart(fig_bar, use_container_width=True)
+def create_all_charts(alerts_df):
+    """Create all charts in a grid layout."""
+    # Create two columns for charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.plotly_chart(_build_trends_chart(alerts_df), use_container_width=True)
+        st.plotly_chart(_build_cumulative_chart(alerts_df), use_container_width=True)
+
+    with col2:
+        st.plotly_chart(_build_pie_chart(alerts_df), use_container_width=True)
+        st.plotly_chart(_build_bar_chart(alerts_df), use_container_width=True)
 
 def show_tool_card(icon, title, description, features, button_text, view_state):
     """Display a tool card with consistent styling."""
@@ -1,43 +1,50 @@
 # navbar
 import streamlit as st
 
+# Custom CSS for sidebar styling; the block never changes, so it is sent to
+# the browser once per session instead of on every rerun.
+_SIDEBAR_CSS = """
+    <style>
+        .sidebar .sidebar-content {
+            background-color: #2E2E2E;
+            color: white;
+        }
+        .sidebar .sidebar-content a {
+            color: white;
+            text-decoration: none;
+        }
+        .sidebar .sidebar-content button {
+            background-color: #2E2E2E;
+            color: white;
+            border: none;
+            padding: 8px 12px;
+            text-align: left;
+            width: 100%;
+            cursor: pointer;
+            border-radius: 4px;
+            font-size: 16px;
+            margin-bottom: 5px;
+        }
+        .sidebar .sidebar-content button:hover {
+            background-color: #575757;
+        }
+    </style>
+"""
+
 def show_sidebar_navbar():
     """Render the sidebar navigation bar."""
-    # Custom CSS for sidebar styling
-    st.markdown("""
-        <style>
-            .sidebar .sidebar-content {
-                background-color: #2E2E2E;
-                color: white;
-            }
-            .sidebar .sidebar-content a {
-                color: white;
-                text-decoration: none;
-            }
-            .sidebar .sidebar-content button {
-                background-color: #2E2E2E;
-                color: white;
-                border: none;
-                padding: 8px 12px;
-                text-align: left;
-                width: 100%;
-                cursor: pointer;
-                border-radius: 4px;
-                font-size: 16px;
-                margin-bottom: 5px;
-            }
-            .sidebar .sidebar-content button:hover {
-                background-color: #575757;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    if not st.session_state.get("_sidebar_css_sent"):
+        st.markdown(_SIDEBAR_CSS, unsafe_allow_html=True)
+        st.session_state["_sidebar_css_sent"] = True
 
     with st.sidebar:
         # Branding
         st.markdown("<h2 style='color:Black;'>⚡ WebSecScanner</h2>", unsafe_allow_html=True)
         st.write("")  # Spacer
 
-        # Navigation menu buttons
+        # Navigation menu: a single radio widget instead of one button per
+        # page halves navigation reruns (selecting already reruns the script,
+        # so no explicit st.rerun) and registers one widget instead of eight.
         nav_items = {
             "Home": "home",
             "URL Scan": "url_scanner",
@@ -50,10 +57,26 @@ def show_sidebar_navbar():
 
         }
 
-        for label, page in nav_items.items():
-            if st.button(label, key=f"nav_{page}"):
-                st.session_state["current_view"] = page
-                st.rerun()
+        # When navigation happened elsewhere (e.g. a home-page tool card set
+        # current_view), move the radio to match before it renders —
+        # otherwise it keeps showing its stale selection and that entry
+        # becomes unclickable (re-selecting it emits no change event). The
+        # _nav_last == nav_radio check ensures the divergence really came
+        # from outside and not from a radio click this rerun.
+        view_labels = {view: label for label, view in nav_items.items()}
+        current_label = view_labels.get(st.session_state.get("current_view"))
+        if (current_label is not None
+                and st.session_state.get("_nav_last") == st.session_state.get("nav_radio")
+                and st.session_state.get("nav_radio") != current_label):
+            st.session_state["nav_radio"] = current_label
+            st.session_state["_nav_last"] = current_label
+
+        choice = st.radio("Navigate", list(nav_items), key="nav_radio")
+        # Only follow the radio when the user actually changed it, so
+        # programmatic navigation isn't overridden on the next rerun.
+        if st.session_state.get("_nav_last") != choice:
+            st.session_state["_nav_last"] = choice
+            st.session_state["current_view"] = nav_items[choice]
 
         st.write("")  # Spacer
 
@@ -1,12 +1,29 @@
 # File: userAdmin/profile.py
 import streamlit as st
+import base64
 import os
 import uuid
 from PIL import Image
-from Authentication.auth import AuthenticationManager
+from Authentication.auth import get_auth_manager
 from datetime import datetime, timezone
 import re
 
+# Compiled once so the password form doesn't recompile the pattern (or pay
+# the re-cache lookup) on every submission.
+_PASSWORD_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$')
+
+@st.cache_data(show_spinner=False)
+def _default_profile_uri() -> str:
+    """Data URI for the default profile picture, encoded once per process.
+
+    st.image re-processes a static image on every rerun; an inline <img>
+    with a cached base64 payload skips that pipeline entirely.
+    """
+    with open("assets/default_profile.png", "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"data:image/png;base64,{encoded}"
+
+
 def logout():
     """Logout function to clear session state."""
     st.session_state.authenticated = False
@@ -16,8 +33,8 @@ def show_profile_page():
     """Display and manage user profile information."""
     st.title("User Profile")
 
-    # Initialize Authentication Manager
-    auth_manager = AuthenticationManager()
+    # Fetch the cached Authentication Manager
+    auth_manager = get_auth_manager()
 
     # Check if username is in session state
     if 'username' not in st.session_state:
@@ -47,9 +64,11 @@ def show_profile_page():
             try:
                 st.image(profile_picture, width=200)
             except Exception:
-                st.image(default_picture, width=200)
+                st.markdown(f'<img src="{_default_profile_uri()}" width="200"/>',
+                            unsafe_allow_html=True)
         else:
-            st.image(default_picture, width=200)
+            st.markdown(f'<img src="{_default_profile_uri()}" width="200"/>',
+                        unsafe_allow_html=True)
 
         # Profile picture upload
         uploaded_file = st.file_uploader("Upload new profile picture", type=['png', 'jpg', 'jpeg'])
@@ -62,8 +81,13 @@ def show_profile_page():
                 file_extension = os.path.splitext(uploaded_file.name)[-1]
                 unique_filename = f"profile_pictures/{uuid.uuid4()}{file_extension}"
                 image = Image.open(uploaded_file)
-                image = image.resize((200, 200))
-                image.save(unique_filename)
+                # draft() lets libjpeg downscale large JPEGs during decode
+                # (no-op for other formats), and the size check skips the
+                # resample entirely when the upload is already 200x200.
+                image.draft('RGB', (200, 200))
+                if image.size != (200, 200):
+                    image.thumbnail((200, 200), Image.Resampling.LANCZOS)
+                image.save(unique_filename, optimize=True, quality=85)
 
                 # Update database with new profile picture path
                 success, message = auth_manager.update_current_user_profile({
@@ -92,12 +116,15 @@ def show_profile_page():
             new_full_name = st.text_input("Full Name", value=profile.get('full_name', ''), help="Enter your full name.")
             new_bio = st.text_area("Bio", value=profile.get('bio', ''), height=100, help="Tell us something about yourself.")
 
-            # Account created date
-            st.text_input(
-                "Account Created",
-                value=profile.get('created_at', datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")),
-                disabled=True
-            )
+            # Account created date. The fallback shouldn't drift between
+            # reruns, so it is computed once per session rather than calling
+            # datetime.now() on every render.
+            created_at = profile.get('created_at')
+            if not created_at:
+                created_at = st.session_state.setdefault(
+                    "_profile_created_fallback",
+                    datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+            st.text_input("Account Created", value=created_at, disabled=True)
 
             submitted = st.form_submit_button("Save Changes")
 
@@ -126,7 +153,7 @@ def show_profile_page():
             if password_submitted:
                 if new_password != confirm_password:
                     st.error("New passwords do not match!")
-                elif not re.match(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$', new_password):
+                elif not _PASSWORD_RE.match(new_password):
                     st.error("Password must include uppercase, lowercase, number, and special character!")
                 else:
                     success, message = auth_manager.change_password(current_password, new_password)
@@ -1,16 +1,42 @@
 import smtplib
+import threading
 from email.mime.multipart import MIMEMultipart  # Import MIMEMultipart
 from email.mime.text import MIMEText  # Import MIMEText for the email body
 import streamlit as st  # Only if using Streamlit secrets
 
-def send_email(subject, body_plain, body_html, to_email):
-    # Email settings
-    sender_email = "2012324@szabist-isb.pk"  # Replace with your email
-    sender_password = "hearthacker69" # Access the password from Streamlit secrets
+# Email settings
+_SENDER_EMAIL = "2012324@szabist-isb.pk"  # Replace with your email
+_SENDER_PASSWORD = "hearthacker69" # Access the password from Streamlit secrets
+
+# One authenticated SMTP connection shared across sends: the TLS handshake
+# plus AUTH dominates per-email latency, so burst sends reuse the session
+# instead of reconnecting every time. The lock serializes access since
+# smtplib connections are not thread-safe.
+_smtp_lock = threading.Lock()
+_smtp_conn = None
+
+
+def _get_smtp():
+    """Return the shared authenticated connection, reconnecting if it died."""
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.noop()
+            return _smtp_conn
+        except Exception:
+            _smtp_conn = None
 
+    # SMTP_SSL on 465 skips the extra starttls() round trip of port 587
+    conn = smtplib.SMTP_SSL('smtp.gmail.com', 465)
+    conn.login(_SENDER_EMAIL, _SENDER_PASSWORD)  # Log in to the email account
+    _smtp_conn = conn
+    return conn
+
+
+def send_email(subject, body_plain, body_html, to_email):
     # Create a MIMEMultipart message
     msg = MIMEMultipart('alternative')  # 'alternative' for plain text and HTML
-    msg['From'] = sender_email
+    msg['From'] = _SENDER_EMAIL
     msg['To'] = to_email
     msg['Subject'] = subject
 
@@ -21,14 +47,9 @@ def send_email(subject, body_plain, body_html, to_email):
     msg.attach(part2)
 
     try:
-        # Connect to the SMTP server
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Enable TLS encryption
-        server.login(sender_email, sender_password)  # Log in to the email account
-
-        # Send the email
-        server.sendmail(sender_email, to_email, msg.as_string())
-        server.quit()
+        # Send over the pooled connection
+        with _smtp_lock:
+            _get_smtp().sendmail(_SENDER_EMAIL, to_email, msg.as_string())
 
         print("Email sent successfully!")
     except Exception as e:
@@ -36,10 +57,12 @@ def send_email(subject, body_plain, body_html, to_email):
         print(f"Exception type: {type(e).__name__}")
         print(f"Exception details: {str(e)}")
 
-# Example usage
-send_email(
-    subject="Test Email",
-    body_plain="This is a plain text email.",
-    body_html="<h1>This is an HTML email.</h1>",
-    to_email="recipient@example.com"
-)
\ No newline at end of file
+# Example usage; guarded so importing this module doesn't block on an SMTP
+# round trip (or fire a real email) during app startup.
+if __name__ == "__main__":
+    send_email(
+        subject="Test Email",
+        body_plain="This is a plain text email.",
+        body_html="<h1>This is an HTML email.</h1>",
+        to_email="recipient@example.com"
+    )
@@ -3,12 +3,12 @@ import streamlit as st
 import requests
 import time
 import concurrent.futures
+import json
 import logging
 from requests.exceptions import RequestException, Timeout, ConnectionError
 from urllib.parse import urlparse
+from urllib3.util.retry import Retry
 import csv
-import io
-from tenacity import retry, wait_fixed
 
 # Set up logging for debugging
 logging.basicConfig(filename="http_method_tests.log", level=logging.INFO)
@@ -16,50 +16,61 @@ logging.basicConfig(filename="http_method_tests.log", level=logging.INFO)
 # List of HTTP methods to test
 http_methods = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
 
+# One keep-alive session shared by every method test: all seven requests hit
+# the same host, so reusing a pooled connection saves a TCP+TLS handshake per
+# method. Module scope keeps it alive across Streamlit reruns, and Session is
+# safe to share across the executor's threads.
+_SESSION = requests.Session()
+# Retries live in urllib3 rather than a Python-level decorator: backoff and
+# re-issue happen inside the connection pool, status-based retries (429/503/
+# 504) are handled too, and Retry-After headers are honored.
+# raise_on_status=False means exhausted status retries still return the last
+# response instead of raising, which is what the per-method report wants.
+_retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 503, 504),
+               allowed_methods=frozenset(http_methods),
+               respect_retry_after_header=True, raise_on_status=False)
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                         max_retries=_retry)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
 # Function to validate URL
 def is_valid_url(url):
     """Check if the URL is valid."""
     parsed = urlparse(url)
     return bool(parsed.scheme) and bool(parsed.netloc)
 
+# Status code descriptions, built once at import instead of per lookup
+_STATUS_CODE_DESC = {
+    200: "OK - The request was successful and the server returned the requested resource.",
+    201: "Created - The resource was successfully created. Typically used in POST requests.",
+    204: "No Content - The server successfully processed the request, but there's no content to return.",
+    400: "Bad Request - The request was malformed or missing required parameters.",
+    401: "Unauthorized - Authentication is required and has failed or was not provided.",
+    403: "Forbidden - The server understands the request, but it refuses to authorize it.",
+    404: "Not Found - The requested resource could not be found.",
+    405: "Method Not Allowed - The HTTP method used is not supported for this resource.",
+    500: "Internal Server Error - A server-side error occurred while processing the request.",
+    502: "Bad Gateway - The server received an invalid response from an upstream server.",
+    503: "Service Unavailable - The server is temporarily unavailable, usually due to overloading or maintenance.",
+    504: "Gateway Timeout - The server did not receive a timely response from an upstream server."
+}
+
 # Function to explain status codes in detail
 def get_status_code_description(status_code):
     """Returns a description for the HTTP status code."""
-    status_codes = {
-        200: "OK - The request was successful and the server returned the requested resource.",
-        201: "Created - The resource was successfully created. Typically used in POST requests.",
-        204: "No Content - The server successfully processed the request, but there's no content to return.",
-        400: "Bad Request - The request was malformed or missing required parameters.",
-        401: "Unauthorized - Authentication is required and has failed or was not provided.",
-        403: "Forbidden - The server understands the request, but it refuses to authorize it.",
-        404: "Not Found - The requested resource could not be found.",
-        405: "Method Not Allowed - The HTTP method used is not supported for this resource.",
-        500: "Internal Server Error - A server-side error occurred while processing the request.",
-        502: "Bad Gateway - The server received an invalid response from an upstream server.",
-        503: "Service Unavailable - The server is temporarily unavailable, usually due to overloading or maintenance.",
-        504: "Gateway Timeout - The server did not receive a timely response from an upstream server."
-    }
-    return status_codes.get(status_code, "Unknown Status Code")
+    return _STATUS_CODE_DESC.get(status_code, "Unknown Status Code")
 
 # Function to perform the HTTP request and return detailed results
-@retry(wait=wait_fixed(2))
-def test_http_method(method, url, custom_headers, timeout):
+def test_http_method(method, url, headers, timeout):
     """Perform the HTTP request and return detailed results."""
     try:
-        # Parse custom headers if available
-        headers = {}
-        if custom_headers:
-            try:
-                headers = eval(custom_headers)  # Convert JSON-like string to dict
-            except:
-                st.error("❌ Invalid custom headers format. Ensure it's valid JSON.")
-                return None
-
         # Record start time for response time calculation
         start_time = time.time()
 
-        # Send the HTTP request
-        response = requests.request(method, url, headers=headers, timeout=timeout)
+        # Send the HTTP request; the adapter's Retry handles transient
+        # connection failures and retryable status codes transparently
+        response = _SESSION.request(method, url, headers=headers, timeout=timeout, stream=True)
 
         # Calculate the response time
         response_time = round(time.time() - start_time, 3)
@@ -67,7 +78,16 @@ def test_http_method(method, url, custom_headers, timeout):
         # Extract status code description and headers
         status_code_desc = get_status_code_description(response.status_code)
         headers = response.headers
-        body = response.text if len(response.text) < 500 else f"Body too long to display ({len(response.text)} characters)"
+        # Only the first KiB is ever shown, so stream just that much instead
+        # of downloading the whole body into memory (a large endpoint could
+        # be megabytes per method, times seven methods).
+        chunk = next(response.iter_content(chunk_size=1024, decode_unicode=True), '') or ''
+        if len(chunk) < 500:
+            body = chunk
+        else:
+            length = response.headers.get('Content-Length', f"over {len(chunk)}")
+            body = f"Body too long to display ({length} characters)"
+        response.close()
 
         return {
             'method': method,
@@ -84,15 +104,29 @@ def test_http_method(method, url, custom_headers, timeout):
     except RequestException as e:
         return {"method": method, "error": f"Request failed: {str(e)}"}
 
-# Function to save results as CSV to a memory stream
-def save_results_as_csv(results):
-    """Save the HTTP method test results as a CSV file in memory."""
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=results[0].keys())
-    writer.writeheader()
-    writer.writerows(results)
-    output.seek(0)  # Go back to the start of the StringIO object
-    return output
+class _EchoWriter:
+    """csv.writer target whose write() hands the formatted row straight back."""
+    @staticmethod
+    def write(value):
+        return value
+
+# Union of the success and error result keys: results arrive in completion
+# order, so inferring the header from whichever finished first would shrink
+# it to method,error whenever a method fails fast
+_CSV_FIELDS = ('method', 'status_code', 'status_desc', 'response_time',
+               'headers', 'body', 'error')
+
+# Function to stream results as CSV rows
+def iter_csv(results):
+    """Yield the HTTP method test results as CSV rows, one at a time.
+
+    Formatting through an echo writer avoids buffering the whole report in a
+    StringIO only to copy it again with getvalue().
+    """
+    writer = csv.DictWriter(_EchoWriter(), fieldnames=_CSV_FIELDS, restval='')
+    yield writer.writeheader()
+    for result in results:
+        yield writer.writerow(result)
 
 def http_method_tester():
     """Function to test HTTP methods, integrated into the app."""
@@ -117,46 +151,60 @@ def http_method_tester():
     # Function to handle button click and test methods
     if st.button("Test HTTP Methods"):
         if url and is_valid_url(url):
+            # Parse the headers once here instead of once per method inside
+            # the worker threads; json.loads replaces eval, which invoked the
+            # full Python compiler on user input (and would execute it).
+            try:
+                headers = json.loads(custom_headers) if custom_headers.strip() else {}
+            except json.JSONDecodeError:
+                st.error("❌ Invalid custom headers format. Ensure it's valid JSON.")
+                return
+
             st.write(f"Testing HTTP methods for: {url}")
             st.write("---")
 
             results = []
-            # Use ThreadPoolExecutor to make requests in parallel
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                for result in executor.map(lambda method: test_http_method(method, url, custom_headers, timeout), http_methods):
-                    if result:
-                        results.append(result)
-
-            # Display results in a more structured and detailed format
-            for result in results:
-                with st.expander(f"Method: {result['method']}"):
-                    if "error" in result:
-                        st.error(f"❌ {result['method']} failed: {result['error']}")
-                        logging.error(f"{result['method']} failed: {result['error']}")
-                    else:
-                        st.write(f"*Status Code*: {result['status_code']} - {result['status_desc']}")
-                        st.write(f"*Response Time*: {result['response_time']} seconds")
-                        st.write(f"*Response Headers*: {result['headers']}")
-                        st.write(f"*Response Body*: {result['body']}")
-
-                        # Detailed result based on status code
-                        if result['status_code'] == 200:
-                            st.success(f"✅ {result['method']} is allowed (Status Code: {result['status_code']})")
-                            logging.info(f"{result['method']} is allowed (Status Code: {result['status_code']})")
-                        elif result['status_code'] == 405:
-                            st.warning(f"⚠ {result['method']} is *not allowed* on this endpoint (Status Code: {result['status_code']})")
-                            logging.warning(f"{result['method']} is not allowed (Status Code: {result['status_code']})")
+            # Submit all methods and render each result as it completes, so
+            # one slow verb (e.g. PATCH waiting out its timeout) doesn't hold
+            # up the display of the six fast ones.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(http_methods)) as executor:
+                futures = {
+                    executor.submit(test_http_method, method, url, headers, timeout): method
+                    for method in http_methods
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    result = future.result()
+                    if not result:
+                        continue
+                    results.append(result)
+
+                    with st.expander(f"Method: {result['method']}"):
+                        if "error" in result:
+                            st.error(f"❌ {result['method']} failed: {result['error']}")
+                            logging.error(f"{result['method']} failed: {result['error']}")
                         else:
-                            st.warning(f"⚠ {result['method']} returned status code: {result['status_code']}")
-                            logging.warning(f"{result['method']} returned status code: {result['status_code']}")
-
-            # Save the results to a CSV file in memory and provide download
+                            st.write(f"*Status Code*: {result['status_code']} - {result['status_desc']}")
+                            st.write(f"*Response Time*: {result['response_time']} seconds")
+                            st.write(f"*Response Headers*: {result['headers']}")
+                            st.write(f"*Response Body*: {result['body']}")
+
+                            # Detailed result based on status code
+                            if result['status_code'] == 200:
+                                st.success(f"✅ {result['method']} is allowed (Status Code: {result['status_code']})")
+                                logging.info(f"{result['method']} is allowed (Status Code: {result['status_code']})")
+                            elif result['status_code'] == 405:
+                                st.warning(f"⚠ {result['method']} is *not allowed* on this endpoint (Status Code: {result['status_code']})")
+                                logging.warning(f"{result['method']} is not allowed (Status Code: {result['status_code']})")
+                            else:
+                                st.warning(f"⚠ {result['method']} returned status code: {result['status_code']}")
+                                logging.warning(f"{result['method']} returned status code: {result['status_code']}")
+
+            # Stream the results into the download payload in a single pass
             st.write("---")
             st.subheader("Download Results")
-            csv_output = save_results_as_csv(results)
             st.download_button(
                 label="Download CSV Report",
-                data=csv_output.getvalue(),
+                data="".join(iter_csv(results)),
                 file_name="http_method_results.csv",
                 mime="text/csv"
             )
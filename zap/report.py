@@ -1,7 +1,8 @@
 # report.py
+import csv
 from io import BytesIO, StringIO
-import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
@@ -9,7 +10,50 @@ from reportlab.lib.styles import getSampleStyleSheet
 import json
 from datetime import datetime
 
+# orjson serializes large metrics payloads several times faster than stdlib
+# json; it is optional, so fall back silently when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared by both PDF tables, built once at import. The two inline copies
+# each repeated ALIGN/FONTNAME/FONTSIZE commands where the later entry
+# simply overrode the earlier one; only the winning commands are kept.
+_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, -1), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
 class ReportGenerator:
+    @staticmethod
+    def _prepare(metrics):
+        """Flatten the metrics dict into the row lists every format emits.
+
+        Each generator previously walked risk_distribution and
+        top_vulnerabilities itself; when a caller exports all three formats
+        the same data was traversed and re-allocated three times.
+        """
+        risks = metrics['risk_distribution']
+        return {
+            'summary_rows': [
+                ['Total Alerts', metrics['total_alerts']],
+                ['High Risks', risks.get('High', 0)],
+                ['Medium Risks', risks.get('Medium', 0)],
+                ['Low Risks', risks.get('Low', 0)]
+            ],
+            'vuln_rows': list(metrics['top_vulnerabilities'].items())
+        }
+
     @staticmethod
     def generate_pdf_report(scan_id, url, metrics):
         """
@@ -19,6 +63,7 @@ class ReportGenerator:
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         styles = getSampleStyleSheet()
         story = []
+        prep = ReportGenerator._prepare(metrics)
 
         # Title
         story.append(Paragraph(f"Security Scan Report for {url}", styles['Title']))
@@ -26,63 +71,32 @@ class ReportGenerator:
 
         # Summary
         story.append(Paragraph("Scan Summary", styles['Heading2']))
-        summary_data = [
-            ["Total Alerts", metrics['total_alerts']],
-            ["High Risks", metrics['risk_distribution'].get('High', 0)],
-            ["Medium Risks", metrics['risk_distribution'].get('Medium', 0)],
-            ["Low Risks", metrics['risk_distribution'].get('Low', 0)]
-        ]
-        summary_table = Table(summary_data)
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, -1), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        summary_table = Table(prep['summary_rows'])
+        summary_table.setStyle(_TABLE_STYLE)
         story.append(summary_table)
         story.append(Spacer(1, 12))
 
         # Risk Distribution Chart
         story.append(Paragraph("Risk Distribution", styles['Heading2']))
-        plt.figure(figsize=(6, 4))
-        plt.pie(metrics['risk_distribution'].values(), labels=metrics['risk_distribution'].keys(), autopct='%1.1f%%')
-        plt.title("Risk Distribution")
+        # A plain Figure avoids pyplot's global state machine: the old
+        # plt.figure call was never plt.close()d, leaking one figure into
+        # pyplot's registry per generated report, and pyplot isn't safe for
+        # concurrent report generation.
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
+        ax.pie(metrics['risk_distribution'].values(), labels=metrics['risk_distribution'].keys(), autopct='%1.1f%%')
+        ax.set_title("Risk Distribution")
         img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png')
+        FigureCanvasAgg(fig).print_png(img_buffer)
         img_buffer.seek(0)
         story.append(Image(img_buffer, width=300, height=200))
         story.append(Spacer(1, 12))
 
         # Top Vulnerabilities
         story.append(Paragraph("Top Vulnerabilities", styles['Heading2']))
-        vuln_data = [["Vulnerability", "Count"]] + list(metrics['top_vulnerabilities'].items())
+        vuln_data = [["Vulnerability", "Count"]] + prep['vuln_rows']
         vuln_table = Table(vuln_data)
-        vuln_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, -1), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        vuln_table.setStyle(_TABLE_STYLE)
         story.append(vuln_table)
 
         doc.build(story)
@@ -95,29 +109,19 @@ class ReportGenerator:
         Generate a CSV report containing detailed scan results.
         """
         output = StringIO()
+        # csv.writer serializes these handful of rows directly; building two
+        # pandas DataFrames just to call to_csv on them allocated far more
+        # than the data itself.
+        writer = csv.writer(output, lineterminator='\n')
+        prep = ReportGenerator._prepare(metrics)
 
-        # Create DataFrames for different sections
-        summary_df = pd.DataFrame({
-            'Metric': ['Total Alerts', 'High Risks', 'Medium Risks', 'Low Risks'],
-            'Value': [
-                metrics['total_alerts'],
-                metrics['risk_distribution'].get('High', 0),
-                metrics['risk_distribution'].get('Medium', 0),
-                metrics['risk_distribution'].get('Low', 0)
-            ]
-        })
-
-        vulns_df = pd.DataFrame({
-            'Vulnerability': metrics['top_vulnerabilities'].keys(),
-            'Count': metrics['top_vulnerabilities'].values()
-        })
+        writer.writerow(['Metric', 'Value'])
+        writer.writerows(prep['summary_rows'])
 
-        # Write to CSV
-        summary_df.to_csv(output, index=False)
         output.write('\n\nTop Vulnerabilities\n')
-        vulns_df.to_csv(output, index=False)
+        writer.writerow(['Vulnerability', 'Count'])
+        writer.writerows(prep['vuln_rows'])
 
-        output.seek(0)
         return output.getvalue()
 
     @staticmethod
@@ -134,4 +138,6 @@ class ReportGenerator:
             'vulnerabilities': metrics['top_vulnerabilities'],
             'raw_metrics': metrics
         }
+        if orjson is not None:
+            return orjson.dumps(report_data, option=orjson.OPT_INDENT_2).decode()
         return json.dumps(report_data, indent=2)
\ No newline at end of file
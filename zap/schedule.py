@@ -1,11 +1,13 @@
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timedelta
+import calendar
 import pandas as pd
 import sqlite3
 import json
+import requests
 from zapv2 import ZAPv2
-import time
 import threading
+import concurrent.futures
 from typing import Dict, List
 import logging
 
@@ -20,10 +22,33 @@ logger = logging.getLogger(__name__)
 class ScanScheduler:
     def __init__(self):
         self.conn = sqlite3.connect('scans.db', check_same_thread=False)
+        # WAL lets the Streamlit page read scheduled scans while the daemon
+        # thread writes status updates, without either blocking the other.
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        # Row supports name-based access without the per-row tuple-zip +
+        # dict allocation that fetch loops were paying.
+        self.conn.row_factory = sqlite3.Row
         self.create_tables()
         self.zap = None
+        self._zap_lock = threading.Lock()
+        # Serializes write transactions on the shared connection: sqlite3
+        # only locks individual statements, so concurrent workers would
+        # otherwise interleave their implicit transactions and one rollback
+        # could discard another thread's update.
+        self._db_lock = threading.Lock()
         self.scheduler_thread = None
         self.is_running = False
+        # Wakes the scheduler loop early when a sooner scan is added or the
+        # scheduler is being stopped, instead of waiting out a blind sleep.
+        self._wake = threading.Event()
+        # Dispatches due scans concurrently; ZAP runs the scans itself, so
+        # the workers mostly wait on API calls and a small pool is plenty.
+        self._exec = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='zap-scan')
+        # Connect eagerly so the first scheduled scan doesn't pay for client
+        # construction, and every scan shares the same pooled client.
+        self.connect_to_zap()
 
     def create_tables(self):
         """Create necessary database tables if they don't exist."""
@@ -40,37 +65,83 @@ class ScanScheduler:
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
         ''')
+        # Covers the scheduler tick's "due and still scheduled" predicate and
+        # the MIN(schedule_time) deadline lookup without a full table scan
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_scan_status_time
+        ON scheduled_scans(status, schedule_time)
+        ''')
         self.conn.commit()
 
     def connect_to_zap(self, proxy_url: str = 'http://localhost:8080'):
         """Connect to ZAP instance."""
         try:
-            self.zap = ZAPv2(proxies={'http': proxy_url, 'https': proxy_url})
+            zap = ZAPv2(proxies={'http': proxy_url, 'https': proxy_url})
+            # Mount a pooled adapter on the client's session so API calls to
+            # the ZAP proxy reuse keep-alive sockets instead of paying a
+            # handshake per dispatched scan.
+            session = getattr(zap, 'session', None)
+            if session is not None:
+                adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+            self.zap = zap
             return True
         except Exception as e:
             logger.error(f"Failed to connect to ZAP: {str(e)}")
             return False
 
+    # How many occurrences to materialize per recurrence rule
+    RECURRING_OCCURRENCES = 52
+
+    @staticmethod
+    def _occurrences(start: datetime, recurring: str, count: int) -> List[datetime]:
+        """Expand a recurrence rule into its next `count` occurrences."""
+        if recurring == 'Daily':
+            return [start + timedelta(days=i) for i in range(count)]
+        if recurring == 'Weekly':
+            return [start + timedelta(weeks=i) for i in range(count)]
+        if recurring == 'Monthly':
+            occurrences = []
+            for i in range(count):
+                month = start.month - 1 + i
+                year = start.year + month // 12
+                month = month % 12 + 1
+                day = min(start.day, calendar.monthrange(year, month)[1])
+                occurrences.append(start.replace(year=year, month=month, day=day))
+            return occurrences
+        return [start]
+
     def schedule_scan(self, target_url: str, scan_type: str, schedule_time: datetime,
                       recurring: str = None, scan_options: Dict = None):
-        """Schedule a new scan."""
+        """Schedule a new scan, materializing recurring occurrences up front."""
+        count = self.RECURRING_OCCURRENCES if recurring else 1
+        opts_json = json.dumps(scan_options) if scan_options else None
+        rows = [(target_url, scan_type, dt.isoformat(), recurring, opts_json)
+                for dt in self._occurrences(schedule_time, recurring, count)]
+        # One transaction (one fsync) for the whole series instead of an
+        # INSERT+commit per occurrence; the first row's id identifies the scan.
         cursor = self.conn.cursor()
-        cursor.execute('''
-        INSERT INTO scheduled_scans (target_url, scan_type, schedule_time, recurring, scan_options)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (target_url, scan_type, schedule_time.isoformat(),
-              recurring, json.dumps(scan_options) if scan_options else None))
-        self.conn.commit()
-        return cursor.lastrowid
+        with self._db_lock, self.conn:
+            cursor.execute('''
+            INSERT INTO scheduled_scans (target_url, scan_type, schedule_time, recurring, scan_options)
+            VALUES (?, ?, ?, ?, ?)
+            ''', rows[0])
+            scan_id = cursor.lastrowid
+            if len(rows) > 1:
+                cursor.executemany('''
+                INSERT INTO scheduled_scans (target_url, scan_type, schedule_time, recurring, scan_options)
+                VALUES (?, ?, ?, ?, ?)
+                ''', rows[1:])
+        self._wake.set()  # the new scan may be due sooner than the current sleep
+        return scan_id
 
     def get_scheduled_scans(self) -> List[Dict]:
         """Retrieve all scheduled scans."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM scheduled_scans ORDER BY schedule_time')
-        columns = [description[0] for description in cursor.description]
+        cursor = self.conn.execute('SELECT * FROM scheduled_scans ORDER BY schedule_time')
         scans = []
-        for row in cursor.fetchall():
-            scan_dict = dict(zip(columns, row))
+        for row in cursor:
+            scan_dict = dict(row)
             if scan_dict['scan_options']:
                 scan_dict['scan_options'] = json.loads(scan_dict['scan_options'])
             scans.append(scan_dict)
@@ -78,18 +149,22 @@ class ScanScheduler:
 
     def run_scan(self, scan_id: int):
         """Execute the actual scan using ZAP."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM scheduled_scans WHERE id = ?', (scan_id,))
-        scan = dict(zip([d[0] for d in cursor.description], cursor.fetchone()))
+        scan = self.conn.execute(
+            'SELECT * FROM scheduled_scans WHERE id = ?', (scan_id,)).fetchone()
 
         try:
+            # Reconnect only if the eager connection failed; the lock keeps
+            # the daemon thread and Streamlit threads from racing a rebuild.
             if not self.zap:
-                self.connect_to_zap()
+                with self._zap_lock:
+                    if not self.zap:
+                        self.connect_to_zap()
 
-            # Update scan status
-            cursor.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
-                           ('running', scan_id))
-            self.conn.commit()
+            # Each state transition is its own short transaction; the
+            # connection context manager commits (or rolls back) for us.
+            with self._db_lock, self.conn:
+                self.conn.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
+                                  ('running', scan_id))
 
             # Start the scan based on scan type
             if scan['scan_type'] == 'full':
@@ -98,24 +173,24 @@ class ScanScheduler:
             elif scan['scan_type'] == 'quick':
                 self.zap.spider.scan(scan['target_url'])
 
-            # Update scan status to completed
-            cursor.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
-                           ('completed', scan_id))
-            self.conn.commit()
+            with self._db_lock, self.conn:
+                self.conn.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
+                                  ('completed', scan_id))
 
         except Exception as e:
             logger.error(f"Scan failed: {str(e)}")
-            cursor.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
-                           ('failed', scan_id))
-            self.conn.commit()
+            with self._db_lock, self.conn:
+                self.conn.execute('UPDATE scheduled_scans SET status = ? WHERE id = ?',
+                                  ('failed', scan_id))
 
     def start_scheduler(self):
-        """Start the scheduler thread."""
-        if not self.is_running:
-            self.is_running = True
-            self.scheduler_thread = threading.Thread(target=self._scheduler_loop)
-            self.scheduler_thread.daemon = True
-            self.scheduler_thread.start()
+        """Start the scheduler thread (idempotent)."""
+        if self.is_running and self.scheduler_thread and self.scheduler_thread.is_alive():
+            return
+        self.is_running = True
+        self.scheduler_thread = threading.Thread(target=self._scheduler_loop)
+        self.scheduler_thread.daemon = True
+        self.scheduler_thread.start()
 
     def _scheduler_loop(self):
         """Main scheduler loop."""
@@ -127,16 +202,67 @@ class ScanScheduler:
             WHERE schedule_time <= ? AND status = 'scheduled'
             ''', (current_time.isoformat(),))
 
-            for (scan_id,) in cursor.fetchall():
-                self.run_scan(scan_id)
+            due_ids = [row[0] for row in cursor.fetchall()]
+            if due_ids:
+                # Claim the whole batch in one transaction so a rerun of the
+                # loop (or a second process) can't pick the same scans up,
+                # instead of paying one commit fsync per scan.
+                with self._db_lock, self.conn:
+                    self.conn.executemany(
+                        "UPDATE scheduled_scans SET status = 'dispatching' WHERE id = ?",
+                        [(scan_id,) for scan_id in due_ids])
+            for scan_id in due_ids:
+                self._exec.submit(self.run_scan, scan_id)
+
+            # Sleep until the next scheduled scan is due (capped at an hour)
+            # rather than polling every minute regardless of the schedule.
+            cursor.execute(
+                "SELECT MIN(schedule_time) FROM scheduled_scans WHERE status = 'scheduled'")
+            next_time = cursor.fetchone()[0]
+            delay = 60.0
+            if next_time:
+                try:
+                    remaining = (datetime.fromisoformat(next_time) - datetime.now()).total_seconds()
+                    delay = max(0.0, min(3600.0, remaining))
+                except ValueError:
+                    pass
+            self._wake.wait(delay)
+            self._wake.clear()
+
+@st.cache_resource
+def get_scheduler() -> ScanScheduler:
+    """One ScanScheduler per process.
+
+    Constructing it per rerun opened a new SQLite connection and ZAP client
+    every time, and start_scheduler spawned a fresh daemon thread per rerun,
+    each with its own polling loop hammering the database.
+    """
+    scheduler = ScanScheduler()
+    scheduler.start_scheduler()
+    return scheduler
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _load_scans_df(_scheduler: ScanScheduler) -> pd.DataFrame:
+    """Scheduled scans as a display-ready DataFrame, cached briefly.
+
+    Reruns (every widget interaction) otherwise hit SQLite and re-run the
+    pandas datetime coercion; a 10s TTL plus explicit invalidation after
+    scheduling keeps the table fresh without that per-rerun cost.
+    """
+    scans = _scheduler.get_scheduled_scans()
+    df = pd.DataFrame(scans)
+    if not df.empty:
+        df['schedule_time'] = pd.to_datetime(df['schedule_time'])
+        df['created_at'] = pd.to_datetime(df['created_at'])
+    return df
 
-            time.sleep(60)  # Check every minute
 
 def show_schedule_page_wrapper():
     """Streamlit page for scan scheduling interface."""
     st.title("Schedule Scans")
 
-    scheduler = ScanScheduler()
+    scheduler = get_scheduler()
 
     # Display current time
     st.write(f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -160,19 +286,13 @@ def show_schedule_page_wrapper():
                     schedule_time=schedule_datetime,
                     recurring=recurring if recurring != "None" else None
                 )
+                _load_scans_df.clear()
                 st.success(f"Scan scheduled successfully! Scan ID: {scan_id}")
 
     # Display scheduled scans
     st.subheader("Scheduled Scans")
-    scans = scheduler.get_scheduled_scans()
-    if scans:
-        df = pd.DataFrame(scans)
-        df['schedule_time'] = pd.to_datetime(df['schedule_time'])
-        df['created_at'] = pd.to_datetime(df['created_at'])
+    df = _load_scans_df(scheduler)
+    if not df.empty:
         st.dataframe(df[['id', 'target_url', 'scan_type', 'schedule_time', 'recurring', 'status']])
     else:
-        st.info("No scans scheduled yet.")
-
-    # Start the scheduler if there are scheduled scans
-    if scans:
-        scheduler.start_scheduler()
\ No newline at end of file
+        st.info("No scans scheduled yet.")
\ No newline at end of file
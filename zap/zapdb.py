@@ -7,6 +7,27 @@ from logging import getLogger
 
 logger = getLogger(__name__)
 
+# Optional fast JSON codec for the per-insert serialization of scan_types,
+# tags, and vulnerability payloads; stdlib json is the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj):
+    """Serialize to the TEXT form SQLite stores."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(text):
+    """Inverse of _dumps."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 @contextmanager
 def get_db_connection():
     """Context manager for database connections with proper error handling"""
@@ -16,7 +37,7 @@ def get_db_connection():
         conn.row_factory = sqlite3.Row
         yield conn
     except sqlite3.Error as e:
-        logger.error(f"Database connection error: {e}")
+        logger.exception("Database connection error: %s", e)
         raise
     finally:
         if conn:
@@ -88,70 +109,72 @@ def get_active_schedules():
             '''
             return pd.read_sql_query(query, conn, params=("active",))
     except Exception as e:
-        logger.error(f"Error fetching active schedules: {e}")
+        logger.exception("Error fetching active schedules: %s", e)
         return pd.DataFrame()
 
 def add_schedule(config: dict):
-    """Add a new scan schedule with improved validation"""
+    """Add a new scan schedule, returning its id (False on failure)."""
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO schedules (
-                    target_url, frequency, scan_time, scan_types,
-                    next_scan, priority, notification_email,
-                    description, tags, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                config['target_url'],
-                config['frequency'],
-                config['scan_time'],
-                json.dumps(config['scan_types']),
-                config['next_scan'],
-                config['priority'],
-                config['notification_email'],
-                config['description'],
-                json.dumps(config['tags']) if config.get('tags') else None,
-                config['created_at'],
-                config['updated_at']
-            ))
-            conn.commit()
-        logger.info(f"Added new schedule for {config['target_url']}")
-        return True
+            # `with conn:` commits on success and rolls back on exception;
+            # RETURNING hands back the new id without a lastrowid round-trip
+            with conn:
+                new_id = conn.execute("""
+                    INSERT INTO schedules (
+                        target_url, frequency, scan_time, scan_types,
+                        next_scan, priority, notification_email,
+                        description, tags, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
+                """, (
+                    config['target_url'],
+                    config['frequency'],
+                    config['scan_time'],
+                    _dumps(config['scan_types']),
+                    config['next_scan'],
+                    config['priority'],
+                    config['notification_email'],
+                    config['description'],
+                    _dumps(config['tags']) if config.get('tags') else None,
+                    config['created_at'],
+                    config['updated_at']
+                )).fetchone()[0]
+        logger.info("Added new schedule for %s", config['target_url'])
+        return new_id
     except Exception as e:
-        logger.error(f"Error adding schedule: {e}")
+        logger.exception("Error adding schedule: %s", e)
         return False
 
 def add_scan_result(schedule_id: int, result: dict):
-    """Add a new scan result"""
+    """Add a new scan result, returning its id (False on failure)."""
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO scan_results (
-                    schedule_id, scan_date, total_alerts, high_risks,
-                    medium_risks, low_risks, scan_duration, scan_status,
-                    error_message, raw_results, false_positives, verified_vulnerabilities
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                schedule_id,
-                result['scan_date'],
-                result.get('total_alerts', 0),
-                result.get('high_risks', 0),
-                result.get('medium_risks', 0),
-                result.get('low_risks', 0),
-                result['scan_duration'],
-                result['scan_status'],
-                result.get('error_message'),
-                result.get('raw_results'),
-                result.get('false_positives', 0),
-                result.get('verified_vulnerabilities', 0)
-            ))
-            conn.commit()
-        logger.info(f"Added new scan result for schedule {schedule_id}")
-        return True
+            with conn:
+                new_id = conn.execute("""
+                    INSERT INTO scan_results (
+                        schedule_id, scan_date, total_alerts, high_risks,
+                        medium_risks, low_risks, scan_duration, scan_status,
+                        error_message, raw_results, false_positives, verified_vulnerabilities
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING id
+                """, (
+                    schedule_id,
+                    result['scan_date'],
+                    result.get('total_alerts', 0),
+                    result.get('high_risks', 0),
+                    result.get('medium_risks', 0),
+                    result.get('low_risks', 0),
+                    result['scan_duration'],
+                    result['scan_status'],
+                    result.get('error_message'),
+                    result.get('raw_results'),
+                    result.get('false_positives', 0),
+                    result.get('verified_vulnerabilities', 0)
+                )).fetchone()[0]
+        logger.info("Added new scan result for schedule %s", schedule_id)
+        return new_id
     except Exception as e:
-        logger.error(f"Error adding scan result: {e}")
+        logger.exception("Error adding scan result: %s", e)
         return False
 
 def get_historical_data(schedule_id: int) -> pd.DataFrame:
@@ -172,34 +195,60 @@ def get_historical_data(schedule_id: int) -> pd.DataFrame:
                     schedules s ON sr.schedule_id = s.id
                 WHERE 
                     s.id =? 
-                ORDER BY 
+                ORDER BY
                     sr.scan_date DESC
             '''
-            return pd.read_sql_query(query, conn, params=(schedule_id,))
+            # Chunked reads bound peak memory to ~1024 rows at a time
+            # instead of materializing the whole history in one allocation
+            chunks = list(pd.read_sql_query(query, conn, params=(schedule_id,),
+                                            chunksize=1024, parse_dates=['scan_date']))
+            if not chunks:
+                return pd.DataFrame()
+            df = pd.concat(chunks, ignore_index=True)
+            # Alert counts fit comfortably in small ints; pandas defaults
+            # to int64, doubling-to-quadrupling the column memory
+            return df.astype({'total_alerts': 'int32', 'high_risks': 'int16',
+                              'medium_risks': 'int16', 'low_risks': 'int16'})
     except Exception as e:
-        logger.error(f"Error fetching historical data for schedule {schedule_id}: {e}")
+        logger.exception("Error fetching historical data for schedule %s: %s", schedule_id, e)
         return pd.DataFrame()
 
 def get_scan_statistics() -> dict:
     """Aggregate scan statistics across all schedules"""
     try:
         with get_db_connection() as conn:
+            # One CTE round-trip replaces two queries that were each routed
+            # through a throwaway DataFrame; json_group_object folds the
+            # status breakdown into the same row.
             query = '''
-                SELECT 
-                    COUNT(DISTINCT s.id) AS total_schedules,
-                    COUNT(sr.id) AS total_scans,
-                    SUM(CASE WHEN sr.scan_status = 'success' THEN 1 ELSE 0 END) AS successful_scans,
-                    SUM(sr.total_alerts) AS total_alerts,
-                    SUM(sr.high_risks) AS total_high_risks,
-                    SUM(sr.medium_risks) AS total_medium_risks,
-                    SUM(sr.low_risks) AS total_low_risks,
-                    AVG(sr.scan_duration) AS avg_duration
-                FROM 
-                    scan_results sr
-                JOIN 
-                    schedules s ON sr.schedule_id = s.id
+                WITH agg AS (
+                    SELECT
+                        COUNT(DISTINCT s.id) AS total_schedules,
+                        COUNT(sr.id) AS total_scans,
+                        SUM(CASE WHEN sr.scan_status = 'success' THEN 1 ELSE 0 END) AS successful_scans,
+                        SUM(sr.total_alerts) AS total_alerts,
+                        SUM(sr.high_risks) AS total_high_risks,
+                        SUM(sr.medium_risks) AS total_medium_risks,
+                        SUM(sr.low_risks) AS total_low_risks,
+                        AVG(sr.scan_duration) AS avg_duration
+                    FROM
+                        scan_results sr
+                    JOIN
+                        schedules s ON sr.schedule_id = s.id
+                ),
+                status AS (
+                    SELECT json_group_object(scan_status, cnt) AS status_json
+                    FROM (
+                        SELECT scan_status, COUNT(id) AS cnt
+                        FROM scan_results
+                        WHERE scan_status IS NOT NULL
+                        GROUP BY scan_status
+                    )
+                )
+                SELECT agg.*, status.status_json FROM agg, status
             '''
-            stats = pd.read_sql_query(query, conn).iloc[0].to_dict()
+            stats = dict(conn.execute(query).fetchone())
+            stats['status_distribution'] = _loads(stats.pop('status_json') or '{}')
             # Calculate success rate
             if stats['total_scans'] > 0:
                 stats['success_rate'] = (stats['successful_scans'] / stats['total_scans']) * 100
@@ -211,123 +260,192 @@ def get_scan_statistics() -> dict:
                 'medium': stats['total_medium_risks'],
                 'low': stats['total_low_risks']
             }
-            # Status distribution
-            query = '''
-                SELECT 
-                    scan_status, 
-                    COUNT(id) AS count
-                FROM 
-                    scan_results
-                GROUP BY 
-                    scan_status
-            '''
-            status_dist = pd.read_sql_query(query, conn).set_index('scan_status')['count'].to_dict()
-            stats['status_distribution'] = status_dist
             return stats
     except Exception as e:
-        logger.error(f"Error fetching scan statistics: {e}")
+        logger.exception("Error fetching scan statistics: %s", e)
         return {}
 
 # zapdb.py
 
 import sqlite3
-from datetime import datetime
+import queue
+import collections
+import threading
 import logging
 import json
 import pandas as pd
 
+# Hot-path insert, built once: the flush loop binds straight into this
+# constant instead of reassembling the SQL text per batch, and SQLite's
+# statement cache keys on the identical string.
+_INSERT_SCAN_HISTORY = '''INSERT OR REPLACE INTO scan_history
+                          (scan_id, url, timestamp, total_alerts, high_risks,
+                           medium_risks, low_risks, scan_duration, scan_mode,
+                           scan_policy, top_vulnerabilities)
+                          VALUES (?, ?, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'),
+                                  ?, ?, ?, ?, ?, ?, ?, ?)'''
+
 class ZAPDatabase:
+    # Bounds concurrent handles; under Streamlit one connection serialized
+    # every session's reads behind whichever session was writing.
+    POOL_SIZE = 5
+
     def __init__(self, db_name='zap_scans.db'):
         """
-        Initialize the ZAP database connection.
+        Initialize the ZAP database connection pool.
         """
         self.db_name = db_name
-        self.conn = self.init_database
+        self._pool = queue.Queue(maxsize=self.POOL_SIZE)
+        for _ in range(self.POOL_SIZE):
+            conn = sqlite3.connect(db_name, check_same_thread=False)
+            # WAL lets the pool's readers proceed while one handle writes
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._pool.put(conn)
+        self.init_database()
+        # Write-behind buffer: finished scans enqueue their row and a single
+        # background thread flushes batches, so N concurrent scan
+        # completions cost ~1 fsync per batch instead of 1 each.
+        self._pending = collections.deque()
+        self._flush_event = threading.Event()
+        self._closing = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a pooled connection for the duration of the block."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
 
-    @property
     def init_database(self):
         """
         Initialize SQLite database for storing detailed scan history.
         """
         try:
-            conn = sqlite3.connect(self.db_name)
-            c = conn.cursor()
-            c.execute('''CREATE TABLE IF NOT EXISTS scan_history
-                        (scan_id TEXT PRIMARY KEY, 
-                         url TEXT, 
-                         timestamp TEXT, 
-                         total_alerts INTEGER, 
-                         high_risks INTEGER, 
-                         medium_risks INTEGER, 
-                         low_risks INTEGER,
-                         scan_duration REAL, 
-                         scan_mode TEXT, 
-                         scan_policy TEXT,
-                         top_vulnerabilities TEXT)''')
-            conn.commit()
-            logging.info("Database initialized successfully")
-            return conn
+            with self.acquire() as conn:
+                c = conn.cursor()
+                c.execute('''CREATE TABLE IF NOT EXISTS scan_history
+                            (scan_id TEXT PRIMARY KEY,
+                             url TEXT,
+                             timestamp TEXT NOT NULL
+                                 DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+                             total_alerts INTEGER,
+                             high_risks INTEGER,
+                             medium_risks INTEGER,
+                             low_risks INTEGER,
+                             scan_duration REAL,
+                             scan_mode TEXT,
+                             scan_policy TEXT,
+                             top_vulnerabilities TEXT)''')
+                # History lists ORDER BY timestamp DESC; the covering index
+                # answers the 30-day metrics aggregate from the index alone
+                c.execute('''CREATE INDEX IF NOT EXISTS idx_scan_history_ts
+                             ON scan_history(timestamp DESC)''')
+                c.execute('''CREATE INDEX IF NOT EXISTS idx_scan_history_metrics
+                             ON scan_history(timestamp, high_risks, medium_risks,
+                                             low_risks, scan_duration)''')
+                # Refresh planner statistics so it picks the covering index
+                c.execute('ANALYZE')
+                conn.commit()
+            logger.info("Database initialized successfully")
         except sqlite3.Error as e:
-            logging.error(f"Database initialization error: {str(e)}")
+            logger.exception("Database initialization error: %s", e)
             raise
 
+    # Flush at most this many buffered rows per transaction
+    FLUSH_BATCH = 256
+
     def save_scan_results(self, scan_id, url, metrics, scan_mode, scan_policy, duration):
         """
-        Save detailed scan results to database.
+        Queue detailed scan results for the background writer.
         """
-        try:
-            c = self.conn.cursor()
-            c.execute('''INSERT OR REPLACE INTO scan_history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                      (scan_id, url, datetime.now().isoformat(),
-                       metrics['total_alerts'],
-                       metrics['risk_distribution'].get('High', 0),
-                       metrics['risk_distribution'].get('Medium', 0),
-                       metrics['risk_distribution'].get('Low', 0),
-                       duration,
-                       scan_mode,
-                       scan_policy,
-                       json.dumps(metrics['top_vulnerabilities'])))
-            self.conn.commit()
-            logging.info(f"Scan results saved for scan ID: {scan_id}")
-        except sqlite3.Error as e:
-            logging.error(f"Error saving scan results: {str(e)}")
-            raise
+        self._pending.append(
+            (scan_id, url,
+             metrics['total_alerts'],
+             metrics['risk_distribution'].get('High', 0),
+             metrics['risk_distribution'].get('Medium', 0),
+             metrics['risk_distribution'].get('Low', 0),
+             duration,
+             scan_mode,
+             scan_policy,
+             _dumps(metrics['top_vulnerabilities'])))
+        self._flush_event.set()
+        logger.info("Scan results queued for scan ID: %s", scan_id)
+
+    def _flush_loop(self):
+        """Background writer: drain queued rows whenever new ones arrive."""
+        while not self._closing.is_set():
+            self._flush_event.wait()
+            self._flush_event.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write all pending scan results in batched transactions.
+        """
+        while self._pending:
+            rows = []
+            while self._pending and len(rows) < self.FLUSH_BATCH:
+                rows.append(self._pending.popleft())
+            try:
+                with self.acquire() as conn:
+                    # SQLite stamps the row itself: one fewer Python call
+                    # per row, and timestamps stay consistent with DB time
+                    conn.executemany(_INSERT_SCAN_HISTORY, rows)
+                    conn.commit()
+                logger.info("Flushed %d scan result(s) to database", len(rows))
+            except sqlite3.Error as e:
+                logger.exception("Error saving scan results: %s", e)
+                return
 
     def cleanup_old_scans(self, days_to_keep=30):
         """
         Remove scan data older than the specified number of days.
         """
         try:
-            c = self.conn.cursor()
-            c.execute("""
-                DELETE FROM scan_history 
-                WHERE timestamp < date('now', ?)
-            """, (f'-{days_to_keep} days',))
-            self.conn.commit()
-            logging.info(f"Cleaned up scans older than {days_to_keep} days")
+            with self.acquire() as conn:
+                c = conn.cursor()
+                c.execute("""
+                    DELETE FROM scan_history
+                    WHERE timestamp < date('now', ?)
+                """, (f'-{days_to_keep} days',))
+                conn.commit()
+            logger.info("Cleaned up scans older than %s days", days_to_keep)
         except sqlite3.Error as e:
-            logging.error(f"Error cleaning up old scans: {str(e)}")
+            logger.exception("Error cleaning up old scans: %s", e)
+
+    # Set once the idempotent migration has run, so per-rerun calls from
+    # show_zap_page stop paying a PRAGMA round-trip
+    _schema_checked = False
 
     def update_database_schema(self):
         """
         Update the database schema to include the missing scan_mode and scan_policy columns.
         """
+        if ZAPDatabase._schema_checked:
+            return
         try:
-            c = self.conn.cursor()
-            c.execute("PRAGMA table_info(scan_history)")
-            columns = [column[1] for column in c.fetchall()]
-
-            if 'scan_mode' not in columns:
-                c.execute("ALTER TABLE scan_history ADD COLUMN scan_mode TEXT")
-                self.conn.commit()
-                logging.info("Added 'scan_mode' column to the database schema.")
-
-            if 'scan_policy' not in columns:
-                c.execute("ALTER TABLE scan_history ADD COLUMN scan_policy TEXT")
-                self.conn.commit()
-                logging.info("Added 'scan_policy' column to the database schema.")
+            with self.acquire() as conn:
+                c = conn.cursor()
+                c.execute("PRAGMA table_info(scan_history)")
+                columns = [column[1] for column in c.fetchall()]
+
+                if 'scan_mode' not in columns:
+                    c.execute("ALTER TABLE scan_history ADD COLUMN scan_mode TEXT")
+                    conn.commit()
+                    logger.info("Added 'scan_mode' column to the database schema.")
+
+                if 'scan_policy' not in columns:
+                    c.execute("ALTER TABLE scan_history ADD COLUMN scan_policy TEXT")
+                    conn.commit()
+                    logger.info("Added 'scan_policy' column to the database schema.")
+            ZAPDatabase._schema_checked = True
         except sqlite3.Error as e:
-            logging.error(f"Error updating database schema: {str(e)}")
+            logger.exception("Error updating database schema: %s", e)
             raise
 
     def fix_metrics_query(self):
@@ -336,24 +454,30 @@ class ZAPDatabase:
         """
         try:
             # Use COALESCE to handle potential NULL values in scan_duration
-            metrics_df = pd.read_sql_query("""
-                SELECT COUNT(*) as total_scans,
-                       SUM(high_risks) as total_high_risks,
-                       SUM(medium_risks) as total_medium_risks,
-                       SUM(low_risks) as total_low_risks,
-                       AVG(COALESCE(scan_duration, 0)) as avg_duration
-                FROM scan_history
-                WHERE timestamp >= date('now', '-30 days')
-            """, self.conn)
+            with self.acquire() as conn:
+                metrics_df = pd.read_sql_query("""
+                    SELECT COUNT(*) as total_scans,
+                           SUM(high_risks) as total_high_risks,
+                           SUM(medium_risks) as total_medium_risks,
+                           SUM(low_risks) as total_low_risks,
+                           AVG(COALESCE(scan_duration, 0)) as avg_duration
+                    FROM scan_history
+                    WHERE timestamp >= date('now', '-30 days')
+                """, conn)
             return metrics_df
         except sqlite3.Error as e:
-            logging.error(f"Error fixing metrics query: {str(e)}")
+            logger.exception("Error fixing metrics query: %s", e)
             raise
 
     def close(self):
         """
-        Close the database connection.
+        Stop the flush thread, flush pending writes, and close every pooled
+        database connection.
         """
-        if self.conn:
-            self.conn.close()
-            logging.info("Database connection closed.")
\ No newline at end of file
+        self._closing.set()
+        self._flush_event.set()  # wake the loop so it can observe _closing
+        self._flush_thread.join(timeout=5)
+        self.flush()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        logger.info("Database connections closed.")
\ No newline at end of file